@@ -2,12 +2,9 @@
 Simple web UI: upload a .docx file and view its paragraph formatting.
 Run: python app.py  then open http://127.0.0.1:5000
 """
-import io
 from flask import Flask, request, jsonify, send_from_directory
 from werkzeug.utils import secure_filename
 
-from format import extract_formatting_from_file
-
 app = Flask(__name__, static_folder="static")
 app.config["MAX_CONTENT_LENGTH"] = 16 * 1024 * 1024  # 16 MB max upload
 ALLOWED_EXTENSIONS = {"docx"}
@@ -17,6 +14,14 @@ def allowed_file(filename):
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
 
+@app.before_request
+def reject_oversized_uploads():
+    # Reject from the Content-Length header alone, before werkzeug buffers the body
+    length = request.content_length
+    if length is not None and length > app.config["MAX_CONTENT_LENGTH"]:
+        return jsonify({"error": "File too large (16 MB max)"}), 413
+
+
 @app.route("/")
 def index():
     return send_from_directory("static", "index.html")
@@ -32,8 +37,13 @@ def upload():
     if not allowed_file(file.filename):
         return jsonify({"error": "Only .docx files are allowed"}), 400
     try:
-        stream = io.BytesIO(file.read())
-        data = extract_formatting_from_file(stream)
+        # Imported on first upload: pulls in python-docx/lxml, which the
+        # static-file and index routes never need (sys.modules caches it after)
+        from format import extract_formatting_from_file
+
+        # file.stream is already seekable; hand it to python-docx directly
+        # instead of copying the whole upload into a second BytesIO buffer
+        data = extract_formatting_from_file(file.stream)
         return jsonify({"ok": True, "data": data, "filename": secure_filename(file.filename)})
     except Exception as e:
         return jsonify({"error": str(e)}), 422
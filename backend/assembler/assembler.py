@@ -1,3 +1,9 @@
+# Built once: leading numbering/markdown chars and bold/italic markers to ignore
+# when comparing a first line against the section name
+_LEAD_CHARS = ".#0123456789) "
+_EMPHASIS_CHARS = "*_"
+
+
 class Assembler:
 
     @staticmethod
@@ -5,15 +11,17 @@ class Assembler:
         """Remove a leading line if it is the section name/title, so sections read as one flow."""
         if not text or not section_name:
             return text
-        lines = text.strip().splitlines()
-        if not lines:
+        # Isolate just the first line; no need to strip/splitlines the whole text
+        stripped = text.lstrip()
+        if not stripped:
             return text
-        first = lines[0].strip()
+        newline = stripped.find("\n")
+        first = (stripped if newline < 0 else stripped[:newline]).strip()
         # Normalize: strip markdown bold, leading numbers/dots, case-insensitive compare
-        normalized_first = first.lstrip(".#0123456789) ").strip().strip("*_")
-        normalized_name = section_name.strip().strip("*_")
-        if normalized_first.lower() == normalized_name.lower():
-            rest = "\n".join(lines[1:]).strip()
+        normalized_first = first.lstrip(_LEAD_CHARS).strip().strip(_EMPHASIS_CHARS)
+        normalized_name = section_name.strip().strip(_EMPHASIS_CHARS)
+        if normalized_first.casefold() == normalized_name.casefold():
+            rest = stripped[newline + 1 :].strip() if newline >= 0 else ""
             return rest if rest else text
         return text
 
@@ -26,4 +34,9 @@ class Assembler:
             text = self._strip_leading_section_title(text, name)
             if text:
                 parts.append(text)
+        # Skip the join (and its concatenated copy) for the 0/1-section cases
+        if not parts:
+            return ""
+        if len(parts) == 1:
+            return parts[0]
         return "\n\n".join(parts)
@@ -3,6 +3,8 @@
 import json
 import logging
 import re
+from collections import deque
+from dataclasses import asdict, dataclass
 from typing import Dict, List, Optional, Tuple
 
 from llm.client import LLMClient
@@ -31,6 +33,20 @@ def _doc_for_discovery(text: str) -> str:
     return text
 
 
+@dataclass(slots=True, frozen=True)
+class Section:
+    """One blueprint section; slots keep per-record overhead low on batch runs."""
+
+    id: int
+    name: str
+    purpose: str = ""
+
+
+def _sections_payload(sections: List[Section]) -> List[Dict]:
+    """Convert internal Section records to plain dicts at the API boundary."""
+    return [asdict(s) for s in sections]
+
+
 SECTION_KEYS = (
     "sections",
     "Sections",
@@ -82,29 +98,34 @@ _DEFAULT_MOTION_SECTIONS = [
 
 
 def _find_sections_list(data) -> Optional[List]:
-    """Find list of sections inside arbitrary JSON."""
+    """Find list of sections inside arbitrary JSON.
 
-    if isinstance(data, list):
-        return data if data else None
+    Breadth-first so the shallowest match wins (usually the right one for
+    well-formed LLM output); iterative to avoid re-walking subtrees.
+    """
 
-    if not isinstance(data, dict):
-        return None
+    queue = deque([data])
+
+    while queue:
+        d = queue.popleft()
+
+        if isinstance(d, list):
+            if d:
+                return d
+            continue
 
-    if "name" in data:
-        return [data]
+        if not isinstance(d, dict):
+            continue
+
+        if "name" in d:
+            return [d]
 
-    for k in SECTION_KEYS:
-        v = data.get(k)
-        if isinstance(v, list) and v:
-            return v
+        for k in SECTION_KEYS:
+            v = d.get(k)
+            if isinstance(v, list) and v:
+                return v
 
-    for v in data.values():
-        if isinstance(v, list) and v:
-            return v
-        if isinstance(v, dict):
-            found = _find_sections_list(v)
-            if found:
-                return found
+        queue.extend(d.values())
 
     return None
 
@@ -142,50 +163,83 @@ def _section_item_to_pair(item) -> Optional[tuple]:
 
 
 
-def _guess_doc_type(text: str) -> str:
-    """Guess document type using heuristics."""
+# Window size for doc-type sniffing; the type markers (summons, motion, ...)
+# appear in the caption/notice pages, so head + tail is enough.
+_DOCTYPE_WINDOW = 4000
+
+# One alternation scan instead of five substring passes; IGNORECASE avoids
+# lowering the sample. "notice of motion" is folded into plain "motion".
+_DOCTYPE_RE = re.compile(r"\b(summons|complaint|motion|petition|affidavit)\b", re.I)
+
+
+def _guess_doc_type(doc1: str, doc2: str) -> str:
+    """Guess document type from the heads and tails of both samples."""
 
-    t = text.lower()
+    sample = "\n".join(
+        (
+            doc1[:_DOCTYPE_WINDOW],
+            doc1[-_DOCTYPE_WINDOW:],
+            doc2[:_DOCTYPE_WINDOW],
+            doc2[-_DOCTYPE_WINDOW:],
+        )
+    )
+
+    hits = {m.group(1).lower() for m in _DOCTYPE_RE.finditer(sample)}
 
-    if "summons" in t and "complaint" in t:
+    if "summons" in hits and "complaint" in hits:
         return "complaint"
 
-    if "notice of motion" in t or "motion" in t:
+    if "motion" in hits:
         return "motion"
 
-    if "petition" in t:
+    if "petition" in hits:
         return "petition"
 
-    if "affidavit" in t:
+    if "affidavit" in hits:
         return "affidavit"
 
     return "unknown"
 
 
+# Compiled once: leading bullet/number markers and the name/purpose separator.
+# Em/en dashes split with or without spaces (names never contain them); plain
+# hyphens only when space-surrounded so hyphenated names survive.
+_LEAD_MARK_RE = re.compile(r"^(?:[-*•]\s+)?(?:\d+[.)]\s*)?")
+_SEP_RE = re.compile(r"\s*[—–]\s*| - |: ")
+
+
 def _parse_discovery_list(raw_list: str) -> List[Tuple[str, str]]:
     """
-    Parse discovery phase output (numbered lines) into (name, purpose) pairs.
-    Handles: "1. Section Name — purpose" or "1) Name - purpose" (dash/colon separators).
+    Parse discovery phase output into (name, purpose) pairs.
+
+    Handles numbered lines ("1. Name — purpose", "2) Name - purpose"), markdown
+    bullets ("- **Name**: purpose"), dashes without surrounding spaces, and
+    purposes wrapped onto unmarked continuation lines. The more variants parsed
+    locally, the more often the Phase-2 structuring LLM call can be skipped.
     """
     out = []
     for line in raw_list.splitlines():
         line = line.strip()
         if not line:
             continue
-        # Strip leading number. or number)
-        rest = re.sub(r"^\d+[.)]\s*", "", line).strip()
+        marked = bool(_LEAD_MARK_RE.match(line).group(0))
+        rest = _LEAD_MARK_RE.sub("", line).strip()
         if not rest:
             continue
-        # Split on first " — " or " - " or ": " for purpose
-        for sep in (" — ", " – ", " - ", ": "):
-            if sep in rest:
-                parts = rest.split(sep, 1)
-                name, purpose = parts[0].strip(), (parts[1].strip() if len(parts) > 1 else "")
-                if name:
-                    out.append((name, purpose))
-                break
+        m = _SEP_RE.search(rest)
+        if m:
+            name = rest[: m.start()].strip().strip("*_ ")
+            purpose = rest[m.end() :].strip()
+            if name:
+                out.append((name, purpose))
+        elif not marked and out and out[-1][1]:
+            # Unmarked line after a "Name — purpose" entry: a purpose wrapped
+            # over two lines. Entries without a purpose never absorb the next
+            # line, so plain name-only lists stay one section per line.
+            name, purpose = out[-1]
+            out[-1] = (name, (purpose + " " + rest).strip())
         else:
-            out.append((rest, ""))
+            out.append((rest.strip("*_ "), ""))
     return out
 
 
@@ -254,7 +308,7 @@ Section List:
 
     # ----------------------------------------------
 
-    def _fallback_sections(self, doc_type: str) -> List[Dict]:
+    def _fallback_sections(self, doc_type: str) -> List[Section]:
         """Return fallback sections."""
 
         if doc_type == "motion":
@@ -263,7 +317,7 @@ Section List:
             base = _DEFAULT_COMPLAINT_SECTIONS
 
         return [
-            {"id": i + 1, "name": n, "purpose": p}
+            Section(id=i + 1, name=n, purpose=p)
             for i, (n, p) in enumerate(base)
         ]
 
@@ -275,8 +329,7 @@ Section List:
         doc1 = clean_text(doc1)
         doc2 = clean_text(doc2)
 
-        combined = doc1 + "\n" + doc2
-        doc_type = _guess_doc_type(combined)
+        doc_type = _guess_doc_type(doc1, doc2)
 
         last_error = None
 
@@ -300,7 +353,7 @@ Section List:
         except Exception as e:
             logger.error("Discovery phase failed: %s", e)
             return {
-                "sections": self._fallback_sections(doc_type),
+                "sections": _sections_payload(self._fallback_sections(doc_type)),
                 "fallback_used": True,
                 "error": str(e),
             }
@@ -310,10 +363,9 @@ Section List:
         if len(parsed) >= 5:
             logger.info("Using %d sections from discovery list (skipping structuring)", len(parsed))
             return {
-                "sections": [
-                    {"id": i + 1, "name": n, "purpose": p or ""}
-                    for i, (n, p) in enumerate(parsed)
-                ],
+                "sections": _sections_payload(
+                    [Section(id=i + 1, name=n, purpose=p or "") for i, (n, p) in enumerate(parsed)]
+                ),
             }
 
         # ==================================================
@@ -350,23 +402,23 @@ Section List:
                     if pair:
                         name, purpose = pair
 
-                        output.append({
-                            "id": len(output) + 1,
-                            "name": name,
-                            "purpose": purpose,
-                        })
+                        output.append(Section(
+                            id=len(output) + 1,
+                            name=name,
+                            purpose=purpose,
+                        ))
 
                 # Validation
                 if len(output) < 5:
                     raise ValueError(f"Too few sections: {len(output)}")
 
                 for s in output:
-                    if not s["name"]:
+                    if not s.name:
                         raise ValueError("Empty section name detected")
 
                 logger.info("Blueprint generated successfully")
 
-                return {"sections": output}
+                return {"sections": _sections_payload(output)}
 
             except Exception as e:
 
@@ -381,16 +433,15 @@ Section List:
         if len(parsed) >= 5:
             logger.info("Using %d sections parsed from discovery list (structuring returned too few)", len(parsed))
             return {
-                "sections": [
-                    {"id": i + 1, "name": n, "purpose": p or ""}
-                    for i, (n, p) in enumerate(parsed)
-                ],
+                "sections": _sections_payload(
+                    [Section(id=i + 1, name=n, purpose=p or "") for i, (n, p) in enumerate(parsed)]
+                ),
             }
 
         logger.error("All blueprint attempts failed, using default sections")
 
         return {
-            "sections": self._fallback_sections(doc_type),
+            "sections": _sections_payload(self._fallback_sections(doc_type)),
             "fallback_used": True,
             "error": str(last_error),
         }
@@ -1,18 +1,179 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 from llm.client import LLMClient
+from utils import llm_cache
+from utils.text_utils import extract_json_from_llm
 
 llm = LLMClient()
 
+# Max concurrent LLM calls; shared knob with the section extractor
+_LLM_CONCURRENCY = int(os.getenv("SANDC_LLM_CONCURRENCY", "8"))
+
+_BATCH_MAX_TOKENS = 8192
+
+
+def _build_batch_prompt(sections, templates, case_data):
+    """One prompt covering every section; the model returns {name: body, ...}."""
+    blocks = []
+    for sec in sections:
+        name = sec.get("name", "")
+        if not name:
+            continue
+        sample = templates.get(name, "") or "(No sample provided; use standard legal format for this section.)"
+        blocks.append(
+            f'Section: "{name}"\n'
+            f"Purpose: {sec.get('purpose', '') or 'See sample for structure.'}\n"
+            f"Sample text (format to follow):\n---\n{sample}\n---"
+        )
+    sections_block = "\n\n".join(blocks)
+    return f"""You are writing every section of a legal document in one pass.
+
+Rules:
+- Return one JSON object mapping each section name (exactly as given) to that section's body text.
+- Get all relevant information from the Case Data; do not invent facts.
+- For each section, follow the exact format and style of its sample (headings, spacing, wording patterns).
+- Do not include the section name or title inside the body text.
+- Use double quotes. Escape newlines in values as \\n. No other text—only the JSON object.
+
+{sections_block}
+
+Case Data:
+{case_data}"""
+
+
+def _parse_batch_response(response, sections):
+    """Map the batched JSON back to section names; None when incomplete/unparseable."""
+    try:
+        data = extract_json_from_llm(response)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    by_folded = {str(k).strip().casefold(): v for k, v in data.items() if k}
+    result = {}
+    for sec in sections:
+        name = sec.get("name", "")
+        if not name:
+            continue
+        val = data.get(name)
+        if val is None:
+            val = by_folded.get(name.casefold())
+        if val is None:
+            return None  # missing section: let the caller fall back to per-section calls
+        result[name] = (val if isinstance(val, str) else str(val)).strip()
+    return result
+
 
 class DraftEngine:
 
     def generate(self, prompts, case_data):
-        result = {}
+        """Generate all sections concurrently (each draft is an independent LLM call).
+
+        Sections that end up with an identical prompt (e.g. same empty sample
+        and purpose) are generated once and the response shared, so duplicates
+        never reach the LLM — even within one concurrent batch.
+        """
+        if not prompts:
+            return {}
+        # Group section names by their final prompt; one LLM call per unique prompt
+        by_prompt = {}
         for name, prompt in prompts.items():
-            final_prompt = prompt + f"\n\nCase Data:\n{case_data}"
-            result[name] = llm.generate(final_prompt)
-        return result
+            by_prompt.setdefault(prompt, []).append(name)
+        unique_prompts = list(by_prompt)
+        workers = min(_LLM_CONCURRENCY, len(unique_prompts))
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            texts = ex.map(
+                lambda prompt: self.generate_one_section(prompt, case_data),
+                unique_prompts,
+            )
+            result = {}
+            for prompt, text in zip(unique_prompts, texts):
+                for name in by_prompt[prompt]:
+                    result[name] = text
+            return result
 
     def generate_one_section(self, prompt: str, case_data: str) -> str:
-        """Generate a single section. Used for streaming/progressive UI."""
+        """Generate a single section. Used for streaming/progressive UI.
+
+        Memoized on (prompt, case_data) so regenerating an unchanged section
+        is a cache hit instead of a fresh LLM call.
+        """
         final_prompt = prompt + f"\n\nCase Data:\n{case_data}"
-        return llm.generate(final_prompt)
+        cache_key = llm_cache.make_key("draft", final_prompt)
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        result = llm.generate(final_prompt)
+        llm_cache.put(cache_key, result)
+        return result
+
+    def stream_one_section(self, prompt: str, case_data: str):
+        """Yield a single section's text in deltas as the model produces them.
+
+        A memo-cache hit yields the whole cached section at once; otherwise the
+        deltas are accumulated and cached on completion.
+        """
+        final_prompt = prompt + f"\n\nCase Data:\n{case_data}"
+        cache_key = llm_cache.make_key("draft", final_prompt)
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            yield cached
+            return
+        parts = []
+        for delta in llm.stream(final_prompt):
+            parts.append(delta)
+            yield delta
+        llm_cache.put(cache_key, "".join(parts))
+
+    async def agenerate_one_section(self, prompt: str, case_data: str, semaphore=None) -> str:
+        """Async twin of generate_one_section; shares its memo cache."""
+        final_prompt = prompt + f"\n\nCase Data:\n{case_data}"
+        cache_key = llm_cache.make_key("draft", final_prompt)
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        if semaphore is None:
+            result = await llm.agenerate(final_prompt)
+        else:
+            async with semaphore:
+                result = await llm.agenerate(final_prompt)
+        llm_cache.put(cache_key, result)
+        return result
+
+    def generate_all(self, sections, templates, case_data):
+        """Draft every section in a single LLM call.
+
+        Collapses N round trips (each re-sending the shared instructions) into
+        one JSON-mode call. Returns None when the response cannot be mapped
+        back to the sections, so callers can fall back to per-section calls.
+        """
+        prompt = _build_batch_prompt(sections, templates, case_data)
+        response = llm.generate(prompt, json_mode=True, max_tokens=_BATCH_MAX_TOKENS)
+        return _parse_batch_response(response, sections)
+
+    async def agenerate_all(self, sections, templates, case_data):
+        """Async twin of generate_all."""
+        prompt = _build_batch_prompt(sections, templates, case_data)
+        response = await llm.agenerate(prompt, json_mode=True, max_tokens=_BATCH_MAX_TOKENS)
+        return _parse_batch_response(response, sections)
+
+    async def agenerate(self, prompts, case_data, semaphore=None):
+        """Async twin of generate: one call per unique prompt, fanned out together."""
+        if not prompts:
+            return {}
+        by_prompt = {}
+        for name, prompt in prompts.items():
+            by_prompt.setdefault(prompt, []).append(name)
+        unique_prompts = list(by_prompt)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(_LLM_CONCURRENCY)
+        texts = await asyncio.gather(
+            *(self.agenerate_one_section(p, case_data, semaphore) for p in unique_prompts)
+        )
+        result = {}
+        for prompt, text in zip(unique_prompts, texts):
+            for name in by_prompt[prompt]:
+                result[name] = text
+        return result
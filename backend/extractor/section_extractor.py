@@ -1,4 +1,9 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from llm.client import LLMClient
+from utils import llm_cache
 from utils.text_utils import extract_json_from_llm
 
 llm = LLMClient()
@@ -7,11 +12,28 @@ llm = LLMClient()
 _EXTRACT_DOC_CHARS = 12000
 _EXTRACT_MAX_TOKENS = 4096
 
+# Max concurrent LLM calls (per extraction run); tune down if the provider rate-limits
+_LLM_CONCURRENCY = int(os.getenv("SANDC_LLM_CONCURRENCY", "8"))
+
 
 def extract_one_section(doc: str, section_name: str) -> str:
-    """Ask LLM to extract a single section; returns extracted text or ''."""
+    """Ask LLM to extract a single section; returns extracted text or ''.
+
+    Results are memoized on (doc chunk, section name) so re-uploading the same
+    sample does not repay the LLM round trip.
+    """
     chunk = doc[:_EXTRACT_DOC_CHARS]
-    prompt = f"""Extract from the document below ONLY the full text of the section titled exactly: "{section_name}".
+    cache_key = llm_cache.make_key("extract", section_name, chunk)
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    result = _extract_one_section_uncached(chunk, section_name)
+    llm_cache.put(cache_key, result)
+    return result
+
+
+def _build_extract_prompt(chunk: str, section_name: str) -> str:
+    return f"""Extract from the document below ONLY the full text of the section titled exactly: "{section_name}".
 
 Rules:
 - Return a JSON object with exactly one key: "{section_name}". The value must be the extracted section text.
@@ -21,43 +43,145 @@ Rules:
 Document:
 {chunk}
 """
-    response = llm.generate(prompt, max_tokens=_EXTRACT_MAX_TOKENS, json_mode=True)
+
+
+def _extract_one_section_uncached(chunk: str, section_name: str) -> str:
+    response = llm.generate(
+        _build_extract_prompt(chunk, section_name),
+        max_tokens=_EXTRACT_MAX_TOKENS,
+        json_mode=True,
+    )
+    return _parse_extract_response(response, section_name)
+
+
+def _parse_extract_response(response: str, section_name: str) -> str:
     try:
         data = extract_json_from_llm(response)
     except ValueError:
         return ""
     if not isinstance(data, dict):
         return ""
-    # Get value by exact or case-insensitive key
+    # Get value by exact key, then by a single casefolded lookup
     val = data.get(section_name)
     if val is None:
-        for k, v in data.items():
-            if k and str(k).strip().lower() == section_name.lower():
-                val = v
-                break
+        by_folded = {str(k).strip().casefold(): v for k, v in data.items() if k}
+        val = by_folded.get(section_name.casefold())
     if val is None:
         return ""
     return (val if isinstance(val, str) else str(val)).strip()
 
 
+async def aextract_one_section(doc: str, section_name: str, semaphore=None) -> str:
+    """Async twin of extract_one_section; shares its memo cache."""
+    chunk = doc[:_EXTRACT_DOC_CHARS]
+    cache_key = llm_cache.make_key("extract", section_name, chunk)
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    prompt = _build_extract_prompt(chunk, section_name)
+    if semaphore is None:
+        response = await llm.agenerate(prompt, max_tokens=_EXTRACT_MAX_TOKENS, json_mode=True)
+    else:
+        async with semaphore:
+            response = await llm.agenerate(prompt, max_tokens=_EXTRACT_MAX_TOKENS, json_mode=True)
+    result = _parse_extract_response(response, section_name)
+    llm_cache.put(cache_key, result)
+    return result
+
+
+def extract_all_sections(doc: str, section_names: list) -> dict:
+    """Extract every named section in a single LLM call.
+
+    One round trip sends the document chunk once instead of once per section,
+    amortizing prompt tokens and latency across the whole blueprint. Returns
+    {} when the batched response cannot be parsed so callers can fall back to
+    per-section extraction.
+    """
+    chunk = doc[:_EXTRACT_DOC_CHARS]
+    names_list = "\n".join(f'- "{name}"' for name in section_names)
+    prompt = f"""Extract from the document below the full text of EACH of these sections:
+{names_list}
+
+Rules:
+- Return one JSON object: {{"sections": {{<section name>: <extracted section text>, ...}}}} with exactly one key per section listed above, using the section names exactly as given.
+- If a section is not found, use "" as its value.
+- Use double quotes. Escape newlines in values as \\n. No other text—only the JSON object.
+
+Document:
+{chunk}
+"""
+    response = llm.generate(prompt, max_tokens=_EXTRACT_MAX_TOKENS * 2, json_mode=True)
+    try:
+        data = extract_json_from_llm(response)
+    except ValueError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    inner = data.get("sections")
+    if isinstance(inner, dict):
+        data = inner
+    # Case-insensitive lookup table for sloppy key casing in the response
+    by_folded = {str(k).strip().lower(): v for k, v in data.items() if k}
+    result = {}
+    for name in section_names:
+        val = data.get(name)
+        if val is None:
+            val = by_folded.get(name.lower())
+        if val is None:
+            return {}  # response is missing sections; let the caller retry per-section
+        result[name] = (val if isinstance(val, str) else str(val)).strip()
+    return result
+
+
 class SectionExtractor:
 
     def extract(self, doc, blueprint, on_section=None):
         """
-        on_section: optional callback(section_name, index_0based, total) for progress.
+        on_section: optional callback(section_name, index_0based, total) for progress,
+        fired as each section finishes (sections run concurrently, so order may vary).
         """
         sections = blueprint.get("sections", [])
         section_names = [s.get("name", "") for s in sections if s.get("name")]
         if not section_names:
             return {}
 
+        # Without a progress callback there is nothing to report per section,
+        # so try the single batched call first (one round trip for all sections).
+        if on_section is None:
+            result = extract_all_sections(doc, section_names)
+            if result:
+                return result
+
+        # Each section is an independent, network-bound LLM call, so run them
+        # concurrently; wall-clock goes from N round trips to roughly one.
         result = {}
         total = len(section_names)
-        for i, name in enumerate(section_names):
-            if not name:
-                continue
-            if callable(on_section):
-                on_section(name, i, total)
-            text = extract_one_section(doc, name)
-            result[name] = text
+        workers = min(_LLM_CONCURRENCY, total)
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            futures = {
+                ex.submit(extract_one_section, doc, name): (i, name)
+                for i, name in enumerate(section_names)
+            }
+            for future in as_completed(futures):
+                i, name = futures[future]
+                result[name] = future.result()
+                if callable(on_section):
+                    on_section(name, i, total)
         return result
+
+    async def aextract(self, doc, blueprint, semaphore=None):
+        """Async twin of extract: fan out all sections with asyncio.gather.
+
+        Pass a shared asyncio.Semaphore to bound concurrency across several
+        aextract calls running in parallel (e.g. both samples at once).
+        """
+        sections = blueprint.get("sections", [])
+        section_names = [s.get("name", "") for s in sections if s.get("name")]
+        if not section_names:
+            return {}
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(_LLM_CONCURRENCY)
+        texts = await asyncio.gather(
+            *(aextract_one_section(doc, name, semaphore) for name in section_names)
+        )
+        return dict(zip(section_names, texts))
@@ -0,0 +1,84 @@
+"""
+Persistent response cache for LLM calls.
+
+Every call site (blueprint generation, section extraction, drafting) repays
+full token cost on identical prompts across process restarts; this SQLite
+cache serves repeats from disk in microseconds. Keys are sha256 over the
+model, generation params, and prompt, so a model or parameter change never
+returns a stale response. Entries expire after a TTL (default 7 days).
+
+Controlled by env vars: SANDC_LLM_CACHE=off disables it, SANDC_LLM_CACHE_PATH
+overrides the database location, SANDC_LLM_CACHE_TTL_DAYS the expiry.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+_DEFAULT_PATH = Path(__file__).resolve().parent.parent / "storage" / "llm_cache.sqlite3"
+_DEFAULT_TTL_DAYS = 7
+
+
+class ResponseCache:
+    def __init__(self, path=None, ttl_seconds=None):
+        self._path = Path(path or os.getenv("SANDC_LLM_CACHE_PATH", _DEFAULT_PATH))
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("SANDC_LLM_CACHE_TTL_DAYS", _DEFAULT_TTL_DAYS)) * 86400
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self._path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT, ts INTEGER)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, prompt: str, max_tokens: int, json_mode: bool, temperature) -> str:
+        raw = f"{model}|{max_tokens}|{json_mode}|{temperature}|{prompt}"
+        return hashlib.sha256(raw.encode("utf-8", "replace")).hexdigest()
+
+    def get(self, key: str):
+        """Return the cached response for key, or None if missing/expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, ts FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        response, ts = row
+        if time.time() - ts > self._ttl:
+            with self._lock:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+            return None
+        return response
+
+    def put(self, key: str, response: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, response, ts) VALUES (?, ?, ?)",
+                (key, response, int(time.time())),
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+
+def get_cache():
+    """Return the process-wide cache, or None when disabled via SANDC_LLM_CACHE=off."""
+    global _cache
+    if os.getenv("SANDC_LLM_CACHE", "").lower() in ("off", "0", "false", "no"):
+        return None
+    if _cache is None:
+        _cache = ResponseCache()
+    return _cache
+
+
+_cache = None
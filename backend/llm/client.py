@@ -6,21 +6,85 @@ from config import (
     AZURE_OPENAI_API_VERSION,
     AZURE_OPENAI_DEPLOYMENT,
 )
+from llm import cache, ratelimit
+
+import asyncio
+import random
+
+import httpx  # already an openai dependency
+from openai import RateLimitError
+
+
+def _make_http_client(client_cls):
+    """Pooled httpx client sized for the concurrent fan-out; HTTP/2 when h2 is installed."""
+    limits = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+    try:
+        return client_cls(http2=True, limits=limits, timeout=60.0)
+    except ImportError:  # httpx raises when the optional h2 package is missing
+        return client_cls(limits=limits, timeout=60.0)
 
 if USE_AZURE_OPENAI:
-    from openai import AzureOpenAI
+    from openai import AsyncAzureOpenAI, AzureOpenAI
     _client = AzureOpenAI(
         azure_endpoint=AZURE_OPENAI_ENDPOINT,
         api_key=AZURE_OPENAI_API_KEY,
         api_version=AZURE_OPENAI_API_VERSION,
+        http_client=_make_http_client(httpx.Client),
+    )
+    _aclient = AsyncAzureOpenAI(
+        azure_endpoint=AZURE_OPENAI_ENDPOINT,
+        api_key=AZURE_OPENAI_API_KEY,
+        api_version=AZURE_OPENAI_API_VERSION,
+        http_client=_make_http_client(httpx.AsyncClient),
     )
     _model = AZURE_OPENAI_DEPLOYMENT
 else:
-    from openai import OpenAI
-    _client = OpenAI(api_key=OPENAI_API_KEY)
+    from openai import AsyncOpenAI, OpenAI
+    _client = OpenAI(api_key=OPENAI_API_KEY, http_client=_make_http_client(httpx.Client))
+    _aclient = AsyncOpenAI(api_key=OPENAI_API_KEY, http_client=_make_http_client(httpx.AsyncClient))
     _model = "gpt-4o-mini"
 
 
+_MAX_RETRIES = 5
+
+
+async def _acreate_with_backoff(kwargs: dict):
+    """Call the async completions endpoint, backing off on 429s with jitter."""
+    for attempt in range(_MAX_RETRIES):
+        try:
+            return await _aclient.chat.completions.create(**kwargs)
+        except RateLimitError as e:
+            if attempt == _MAX_RETRIES - 1:
+                raise
+            retry_after = None
+            response = getattr(e, "response", None)
+            if response is not None:
+                retry_after = response.headers.get("retry-after")
+            try:
+                delay = float(retry_after) if retry_after else min(2.0 ** attempt, 30.0)
+            except ValueError:
+                delay = min(2.0 ** attempt, 30.0)
+            await asyncio.sleep(delay + random.uniform(0.0, 1.0))
+
+
+def _build_kwargs(
+    prompt: str,
+    max_tokens: int,
+    json_mode: bool,
+    temperature: float | None,
+) -> dict:
+    kwargs = {
+        "model": _model,
+        "messages": [{"role": "user", "content": prompt}],
+        "max_tokens": max_tokens,
+    }
+    if json_mode:
+        kwargs["response_format"] = {"type": "json_object"}
+    if temperature is not None:
+        kwargs["temperature"] = temperature
+    return kwargs
+
+
 class LLMClient:
     def generate(
         self,
@@ -29,14 +93,55 @@ class LLMClient:
         json_mode: bool = False,
         temperature: float | None = None,
     ) -> str:
-        kwargs = {
-            "model": _model,
-            "messages": [{"role": "user", "content": prompt}],
-            "max_tokens": max_tokens,
-        }
-        if json_mode:
-            kwargs["response_format"] = {"type": "json_object"}
-        if temperature is not None:
-            kwargs["temperature"] = temperature
+        response_cache = cache.get_cache()
+        if response_cache is not None:
+            key = cache.ResponseCache.make_key(_model, prompt, max_tokens, json_mode, temperature)
+            cached = response_cache.get(key)
+            if cached is not None:
+                return cached
+        kwargs = _build_kwargs(prompt, max_tokens, json_mode, temperature)
         response = _client.chat.completions.create(**kwargs)
-        return response.choices[0].message.content or ""
+        text = response.choices[0].message.content or ""
+        if response_cache is not None:
+            response_cache.put(key, text)
+        return text
+
+    def stream(
+        self,
+        prompt: str,
+        max_tokens: int = 4096,
+        json_mode: bool = False,
+        temperature: float | None = None,
+    ):
+        """Yield response text deltas as they arrive (stream=True completion)."""
+        kwargs = _build_kwargs(prompt, max_tokens, json_mode, temperature)
+        for chunk in _client.chat.completions.create(stream=True, **kwargs):
+            if chunk.choices:
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+
+    async def agenerate(
+        self,
+        prompt: str,
+        max_tokens: int = 4096,
+        json_mode: bool = False,
+        temperature: float | None = None,
+    ) -> str:
+        """Async twin of generate, for fan-out over many independent calls."""
+        response_cache = cache.get_cache()
+        if response_cache is not None:
+            key = cache.ResponseCache.make_key(_model, prompt, max_tokens, json_mode, temperature)
+            cached = response_cache.get(key)
+            if cached is not None:
+                return cached
+        limiter = ratelimit.get_limiter()
+        if limiter is not None:
+            # Rough estimate: ~4 chars per prompt token, plus the output budget
+            await limiter.acquire(len(prompt) // 4 + max_tokens)
+        kwargs = _build_kwargs(prompt, max_tokens, json_mode, temperature)
+        response = await _acreate_with_backoff(kwargs)
+        text = response.choices[0].message.content or ""
+        if response_cache is not None:
+            response_cache.put(key, text)
+        return text
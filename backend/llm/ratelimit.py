@@ -0,0 +1,75 @@
+"""
+Token-bucket rate limiting for the async LLM client.
+
+Unbounded asyncio.gather over many sections either trips the provider's rate
+limit (429s and retries erase the speedup) or, if throttled too hard, leaves
+throughput on the table. The RateLimiter admits requests at the configured
+requests-per-minute and tokens-per-minute so sustained throughput sits just
+under the plan cap.
+
+Disabled unless at least one cap is configured:
+  SANDC_LLM_RPM  requests per minute (0/unset = unlimited)
+  SANDC_LLM_TPM  tokens per minute   (0/unset = unlimited)
+"""
+import asyncio
+import os
+import time
+
+
+class RateLimiter:
+    """Admit requests at a sustained RPM/TPM via a monotonic-refill token bucket."""
+
+    def __init__(self, rpm: int, tpm: int):
+        self._rpm = rpm
+        self._tpm = tpm
+        # Start with a full minute's budget so short bursts are not penalized
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._requests = min(float(self._rpm), self._requests + elapsed * self._rpm / 60.0)
+        self._tokens = min(float(self._tpm), self._tokens + elapsed * self._tpm / 60.0)
+
+    async def acquire(self, tokens: int) -> None:
+        """Block until one request slot and `tokens` tokens are available.
+
+        Estimates above the bucket capacity are clamped to it: the bucket can
+        never hold more than a minute's budget, so waiting for the full amount
+        would deadlock. Such a request simply drains the whole bucket.
+        """
+        if tokens > self._tpm:
+            tokens = self._tpm
+        while True:
+            async with self._lock:
+                self._refill()
+                if self._requests >= 1.0 and self._tokens >= tokens:
+                    self._requests -= 1.0
+                    self._tokens -= tokens
+                    return
+                # Sleep long enough for the scarcer budget to replenish
+                need_req = (1.0 - self._requests) * 60.0 / self._rpm
+                need_tok = (tokens - self._tokens) * 60.0 / self._tpm
+                wait = max(need_req, need_tok, 0.05)
+            await asyncio.sleep(wait)
+
+
+_limiter: RateLimiter | None = None
+_initialized = False
+
+
+def get_limiter() -> RateLimiter | None:
+    """Lazy singleton; None when neither SANDC_LLM_RPM nor SANDC_LLM_TPM is set."""
+    global _limiter, _initialized
+    if not _initialized:
+        rpm = int(os.getenv("SANDC_LLM_RPM", "0"))
+        tpm = int(os.getenv("SANDC_LLM_TPM", "0"))
+        if rpm > 0 or tpm > 0:
+            # Either cap may be left unset; give it an effectively unlimited budget
+            _limiter = RateLimiter(rpm or 10**9, tpm or 10**9)
+        _initialized = True
+    return _limiter
@@ -1,14 +1,23 @@
+import asyncio
 import json
-from io import BytesIO
+import os
 from pathlib import Path
+from typing import BinaryIO
 
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+try:
+    import orjson
+except ModuleNotFoundError:  # optional speedup; stdlib json still works
+    orjson = None
+
+from fastapi import BackgroundTasks, FastAPI, UploadFile, File, Form, HTTPException
+from fastapi.concurrency import run_in_threadpool
 
 from blueprint.generator import BlueprintGenerator
 from extractor.section_extractor import SectionExtractor
 from promps.prompt_builder import PromptBuilder
 from drafts.draft_engine import DraftEngine
 from assembler.assembler import Assembler
+from utils.docx_text import docx_to_text
 
 
 app = FastAPI(title="Legal Drafting API")
@@ -16,18 +25,32 @@ app = FastAPI(title="Legal Drafting API")
 # Legacy .doc (OLE) magic bytes
 OLE_MAGIC = b"\xd0\xcf\x11\xe0"
 
+# Cap on concurrent LLM calls across the whole pipeline (both samples + drafts)
+_LLM_CONCURRENCY = int(os.getenv("SANDC_LLM_CONCURRENCY", "8"))
+
 
 def _save_templates(blueprint: dict, templates: dict) -> None:
     """Store blueprint (sections list) and per-section sample content in storage/templates.json."""
     path = Path(__file__).resolve().parent / "storage" / "templates.json"
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump({"blueprint": blueprint, "templates": templates}, f, indent=2)
-
-
-def _file_to_text(data: bytes, filename: str) -> str:
-    """Extract plain text from uploaded file. Supports .txt (UTF-8/cp1252) and .docx."""
-    if data.startswith(OLE_MAGIC):
+    payload = {"blueprint": blueprint, "templates": templates}
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+
+
+def _file_to_text(stream: BinaryIO, filename: str) -> str:
+    """Extract plain text from an uploaded file stream. Supports .txt (UTF-8/cp1252) and .docx.
+
+    Works directly on the upload's SpooledTemporaryFile so the payload is never
+    duplicated into an intermediate bytes object; only the 4-byte OLE magic is
+    read up front for the legacy-.doc check.
+    """
+    magic = stream.read(4)
+    stream.seek(0)
+    if magic == OLE_MAGIC:
         raise HTTPException(
             status_code=400,
             detail="Legacy .doc (binary) is not supported. Please upload .docx or .txt files.",
@@ -35,12 +58,11 @@ def _file_to_text(data: bytes, filename: str) -> str:
     name = (filename or "").lower()
     if name.endswith(".docx"):
         try:
-            from docx import Document
-            doc = Document(BytesIO(data))
-            return "\n".join(p.text for p in doc.paragraphs)
+            return docx_to_text(stream)
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Invalid .docx file: {e}") from e
     # Plain text: try UTF-8, then Windows-1252
+    data = stream.read()
     try:
         return data.decode("utf-8")
     except UnicodeDecodeError:
@@ -55,28 +77,38 @@ def _file_to_text(data: bytes, filename: str) -> str:
 
 @app.post("/generate-draft")
 async def generate_draft(
+    background_tasks: BackgroundTasks,
     sample1: UploadFile = File(...),
     sample2: UploadFile = File(...),
     case_summary: str = Form(...),
 ):
-    # Read files (supports .txt and .docx; rejects binary .doc)
-    raw1 = await sample1.read()
-    raw2 = await sample2.read()
-    s1 = _file_to_text(raw1, sample1.filename or "")
-    s2 = _file_to_text(raw2, sample2.filename or "")
+    # Read files (supports .txt and .docx; rejects binary .doc). Parsing docx is
+    # CPU-bound, so push both off the event loop and run them in parallel.
+    # UploadFile.file is a SpooledTemporaryFile: hand it to the parser directly
+    # instead of materializing the whole payload as bytes first.
+    s1, s2 = await asyncio.gather(
+        run_in_threadpool(_file_to_text, sample1.file, sample1.filename or ""),
+        run_in_threadpool(_file_to_text, sample2.file, sample2.filename or ""),
+    )
 
     try:
-        blueprint = BlueprintGenerator().generate(s1, s2)
+        # Blueprint generation blocks on sequential LLM phases; keep it off the loop too
+        blueprint = await run_in_threadpool(BlueprintGenerator().generate, s1, s2)
     except ValueError as e:
         raise HTTPException(
             status_code=422,
             detail={"step": "blueprint", "message": str(e)},
         ) from e
 
+    # Both samples' per-section extractions are independent LLM calls: fan them
+    # all out together, bounded by one shared semaphore.
     ext = SectionExtractor()
+    semaphore = asyncio.Semaphore(_LLM_CONCURRENCY)
     try:
-        t1 = ext.extract(s1, blueprint)
-        t2 = ext.extract(s2, blueprint)
+        t1, t2 = await asyncio.gather(
+            ext.aextract(s1, blueprint, semaphore),
+            ext.aextract(s2, blueprint, semaphore),
+        )
     except ValueError as e:
         raise HTTPException(
             status_code=422,
@@ -91,20 +123,37 @@ async def generate_draft(
         part2 = t2.get(name, "")
         templates[name] = (part1 + "\n" + part2).strip() if (part1 or part2) else ""
 
-    # Persist blueprint + section sample content to templates.json
-    _save_templates(blueprint, templates)
+    # Persist blueprint + section sample content to templates.json after the
+    # response is sent — the client never reads it from this response
+    background_tasks.add_task(_save_templates, blueprint, templates)
 
     # Step 4: Build dynamic prompts (section name, purpose, sample text)
     builder = PromptBuilder()
     prompts = {}
+    skipped = {}
     for sec in blueprint["sections"]:
         name = sec["name"]
         purpose = sec.get("purpose", "")
         examples = templates.get(name, "")
+        if not examples.strip() and not purpose.strip():
+            # No sample text and no purpose: the prompt is pure boilerplate and
+            # the model pads it with generic filler. Emit an empty section instead.
+            skipped[name] = ""
+            continue
         prompts[name] = builder.build(name, purpose, examples)
 
-    # Step 5: Generate each section (prompt + case data → AI)
-    sections = DraftEngine().generate(prompts, case_summary)
+    # Step 5: Generate all sections in one batched call; fall back to the
+    # concurrent per-section fan-out when the batched JSON cannot be mapped back
+    engine = DraftEngine()
+    draftable = [sec for sec in blueprint["sections"] if sec["name"] not in skipped]
+    if not draftable:
+        # Everything was skipped: no point sending an empty batch to the model
+        sections = {}
+    else:
+        sections = await engine.agenerate_all(draftable, templates, case_summary)
+        if sections is None:
+            sections = await engine.agenerate(prompts, case_summary, semaphore)
+    sections.update(skipped)
 
     # Step 6: Assemble draft (join sections in blueprint order)
     final_doc = Assembler().assemble(blueprint, sections)
@@ -1,21 +1,31 @@
+# Invariant instructions shared by every section prompt. Kept first so all N
+# section calls share one prompt prefix: providers with automatic prefix
+# caching (OpenAI) then bill/recompute only the per-section tail.
+SECTION_PREAMBLE = """You are writing one section of a legal document.
+
+Use the Case Data/Summary provided below to get the facts and information for this section. Write only what belongs in this section. Match the format, style, and structure of the sample(s) below so the new section looks like the examples.
+
+Rules:
+- Get all relevant information from the Case Data for this section only.
+- Follow the exact format and style of the sample (headings, spacing, wording patterns).
+- Do not invent facts; use only what is in the Case Data.
+- Output only the section text, no meta-commentary.
+- Do NOT include the section name or title in your output. Write only the body content so this section reads as a direct continuation of the document, not as a new headed section.
+
+The section to write, its purpose, and the sample(s) to imitate follow."""
+
+
 class PromptBuilder:
 
     def build(self, name, purpose, examples):
         """Build a prompt so the LLM knows: what to take from the Case Summary, and which format to use (from sample)."""
-        return f"""You are writing the "{name}" section of a legal document.
+        return f"""{SECTION_PREAMBLE}
 
-Purpose of this section: {purpose or "See sample for structure."}
+Section to write: "{name}"
 
-Use the Case Data/Summary provided below to get the facts and information for this section. Write only what belongs in this section. Match the format, style, and structure of the sample(s) below so the new section looks like the examples.
+Purpose of this section: {purpose or "See sample for structure."}
 
 Sample text for this section (format to follow):
 ---
 {examples or "(No sample provided; use standard legal format for this section.)"}
----
-
-Rules:
-- Get all relevant information from the Case Data for this section only.
-- Follow the exact format and style of the sample (headings, spacing, wording patterns).
-- Do not invent facts; use only what is in the Case Data.
-- Output only the section text, no meta-commentary.
-- Do NOT include the section name or title in your output. Write only the body content so this section reads as a direct continuation of the document, not as a new headed section."""
+---"""
@@ -5,7 +5,6 @@ Or from project root: streamlit run backend/streamlit_app.py
 """
 import json
 import sys
-from io import BytesIO
 from pathlib import Path
 
 # Ensure backend is on path when run from project root
@@ -15,6 +14,11 @@ if str(_backend) not in sys.path:
 
 import streamlit as st
 
+try:
+    import orjson
+except ModuleNotFoundError:  # optional speedup; stdlib json still works
+    orjson = None
+
 # Backend imports (after path fix)
 from blueprint.generator import BlueprintGenerator
 from extractor.section_extractor import SectionExtractor
@@ -28,8 +32,12 @@ OLE_MAGIC = b"\xd0\xcf\x11\xe0"
 def _save_templates(blueprint: dict, templates: dict) -> None:
     path = Path(__file__).resolve().parent / "storage" / "templates.json"
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump({"blueprint": blueprint, "templates": templates}, f, indent=2)
+    payload = {"blueprint": blueprint, "templates": templates}
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
 
 
 def file_to_text(data: bytes, filename: str) -> str:
@@ -38,15 +46,28 @@ def file_to_text(data: bytes, filename: str) -> str:
         raise ValueError("Legacy .doc (binary) is not supported. Please upload .docx or .txt files.")
     name = (filename or "").lower()
     if name.endswith(".docx"):
-        from docx import Document
-        doc = Document(BytesIO(data))
-        return "\n".join(p.text for p in doc.paragraphs)
+        from utils.docx_text import docx_to_text
+        return docx_to_text(data)
     try:
         return data.decode("utf-8")
     except UnicodeDecodeError:
         return data.decode("cp1252")
 
 
+# Cached on argument content: re-running with the same samples (the common
+# "tweak the case summary and regenerate" loop) skips the blueprint call and
+# all per-section extraction LLM calls.
+@st.cache_data(show_spinner=False)
+def _cached_blueprint(s1: str, s2: str):
+    return BlueprintGenerator().generate(s1, s2)
+
+
+@st.cache_data(show_spinner=False)
+def _cached_extract(sample_text: str, section_name: str) -> str:
+    from extractor.section_extractor import extract_one_section
+    return extract_one_section(sample_text, section_name)
+
+
 st.set_page_config(page_title="Document Generator", layout="wide")
 st.title("Legal Document Generator")
 
@@ -79,7 +100,7 @@ def run_pipeline():
     # --- Step 1: Blueprint ---
     st.subheader("Identified sections")
     try:
-        blueprint = BlueprintGenerator().generate(s1, s2)
+        blueprint = _cached_blueprint(s1, s2)
     except ValueError as e:
         st.error(f"Blueprint failed: {e}")
         return
@@ -92,7 +113,6 @@ def run_pipeline():
     # --- Step 2: Extract templates (section-by-section so UI updates after each LLM call) ---
     st.subheader("Step 2: Extracting section text from samples")
     st.caption("This step can take a few minutes. Progress updates below.")
-    from extractor.section_extractor import extract_one_section
     progress = st.progress(0, text="Starting...")
     status_placeholder = st.empty()
     t1 = {}
@@ -106,7 +126,7 @@ def run_pipeline():
                 continue
             status_placeholder.caption(f"Sample 1 — section {i + 1}/{len(sections)}: **{name}**")
             progress.progress(step / total_steps, text=f"Sample 1: {name}")
-            t1[name] = extract_one_section(s1, name)
+            t1[name] = _cached_extract(s1, name)
             step += 1
         for i, sec in enumerate(sections):
             name = sec["name"]
@@ -114,7 +134,7 @@ def run_pipeline():
                 continue
             status_placeholder.caption(f"Sample 2 — section {i + 1}/{len(sections)}: **{name}**")
             progress.progress(step / total_steps, text=f"Sample 2: {name}")
-            t2[name] = extract_one_section(s2, name)
+            t2[name] = _cached_extract(s2, name)
             step += 1
     except Exception as e:
         progress.empty()
@@ -156,11 +176,17 @@ def _run_generation(st, sections, blueprint, templates, case_summary):
         name = sec["name"]
         purpose = sec.get("purpose", "")
         examples = templates.get(name, "")
+        if not examples.strip() and not purpose.strip():
+            # No sample text and no purpose: the prompt is pure boilerplate and
+            # the model pads it with generic filler, so skip the LLM call.
+            continue
         prompts[name] = builder.build(name, purpose, examples)
 
     with st.expander("View prompt ingredients and full prompt for each section", expanded=False):
         for sec in sections:
             name = sec["name"]
+            if name not in prompts:
+                continue
             purpose = sec.get("purpose", "") or "(none)"
             sample_preview = (templates.get(name, "") or "")[:400]
             if len(templates.get(name, "") or "") > 400:
@@ -184,9 +210,21 @@ def _run_generation(st, sections, blueprint, templates, case_summary):
 
     for i, sec in enumerate(sections):
         name = sec["name"]
+        if name not in prompts:
+            # Empty sample and empty purpose: nothing worth generating
+            draft_parts.append("")
+            continue
+        current_draft = "\n\n".join(draft_parts)
         with st.status(f"Generating section {i + 1}/{len(sections)}: **{name}**", state="running"):
-            text = engine.generate_one_section(prompts[name], case_summary or "")
-            draft_parts.append(text.strip())
+            # Stream deltas so the draft grows token by token instead of
+            # blocking until the whole section is finished
+            buf = ""
+            for delta in engine.stream_one_section(prompts[name], case_summary or ""):
+                buf += delta
+                draft_placeholder.code(
+                    (current_draft + "\n\n" + buf) if current_draft else buf, language=None
+                )
+            draft_parts.append(buf.strip())
         current_draft = "\n\n".join(draft_parts)
         draft_placeholder.code(current_draft, language=None)
 
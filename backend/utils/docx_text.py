@@ -0,0 +1,45 @@
+"""
+Fast plain-text extraction from .docx files.
+
+The pipelines only need paragraph text from the samples, so building the full
+python-docx object model (a Paragraph/Run wrapper per element) is pure
+overhead. This streams word/document.xml with lxml.etree.iterparse and joins
+the <w:t> text nodes per paragraph, clearing elements as it goes to keep peak
+memory flat on large documents.
+"""
+from io import BytesIO
+import zipfile
+
+from lxml import etree
+
+_W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_W_P = _W_NS + "p"
+_W_T = _W_NS + "t"
+# Compatibility fallbacks (mc:Fallback) duplicate the content of their
+# mc:Choice sibling — e.g. text boxes — so their paragraphs must be skipped
+# or that text would be emitted twice
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+
+def docx_to_text(source) -> str:
+    """Extract paragraph text from a .docx (bytes or seekable file object).
+
+    Visits every <w:p> in document.xml — deliberately including paragraphs
+    inside table cells, which python-docx's doc.paragraphs excludes: the
+    section pipelines want all sample text. Paragraphs under mc:Fallback are
+    skipped since they repeat their mc:Choice sibling's content. Returns
+    paragraphs joined with newlines.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        source = BytesIO(source)
+    texts = []
+    with zipfile.ZipFile(source) as z, z.open("word/document.xml") as f:
+        for _event, elem in etree.iterparse(f, tag=_W_P):
+            if any(a.tag == _MC_FALLBACK for a in elem.iterancestors()):
+                # Clearing here also empties the fallback's text before any
+                # enclosing paragraph joins its own descendants
+                elem.clear()
+                continue
+            texts.append("".join(t.text or "" for t in elem.iter(_W_T)))
+            elem.clear()
+    return "\n".join(texts)
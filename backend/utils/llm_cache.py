@@ -0,0 +1,45 @@
+"""
+In-process memo cache for LLM call results.
+
+Section extraction and drafting re-run the same prompts constantly during
+iterative sessions (same samples re-uploaded, same case summary tweaked); a
+cache hit turns a multi-second LLM round trip into a dict lookup. Keys are
+blake2b digests of the call inputs so large prompts are not held as keys.
+"""
+import hashlib
+import threading
+
+_MAX_ENTRIES = 1024
+
+_cache: dict = {}
+_lock = threading.Lock()
+
+
+def make_key(*parts: str) -> str:
+    """Digest the call inputs (prompt text, section name, params) into a cache key."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part.encode("utf-8", "replace"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+def get(key: str):
+    """Return the cached response for key, or None."""
+    with _lock:
+        return _cache.get(key)
+
+
+def put(key: str, value: str) -> None:
+    """Store a response; evicts oldest entries when the cache is full."""
+    with _lock:
+        if len(_cache) >= _MAX_ENTRIES:
+            # dicts preserve insertion order; drop the oldest entry
+            _cache.pop(next(iter(_cache)))
+        _cache[key] = value
+
+
+def clear() -> None:
+    """Drop all cached responses."""
+    with _lock:
+        _cache.clear()
@@ -1,76 +1,67 @@
 import json
 import re
 
+# orjson parses in C, ~2-3x faster than stdlib json; fall back when not installed
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
+
+
+# Compiled once: trailing commas before } or ], and double-quoted JSON strings
+# (re.S lets them span raw newlines, which is exactly the case we repair)
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+_JSON_STRING_RE = re.compile(r'"((?:[^"\\]|\\.)*)"', re.S)
+
+_DECODER = json.JSONDecoder()
+
+
+def _first_json_start(s: str, from_idx: int) -> int:
+    """Index of the next { or [ at or after from_idx, or -1."""
+    starts = [p for p in (s.find("{", from_idx), s.find("[", from_idx)) if p != -1]
+    return min(starts) if starts else -1
+
+
+def _loads(s: str):
+    """Parse JSON with orjson when available, stdlib json otherwise."""
+    if orjson is not None:
+        return orjson.loads(s)
+    return json.loads(s)
+
 
 def _try_parse(s: str):
-    """Try json.loads; optionally fix trailing commas, escape newlines in strings, and retry."""
+    """Try parsing; optionally fix trailing commas, escape newlines in strings, and retry."""
     try:
-        return json.loads(s)
+        return _loads(s)
     except json.JSONDecodeError:
         pass
     # Fix trailing commas (common in LLM output)
-    fixed = re.sub(r",\s*}", "}", re.sub(r",\s*]", "]", s))
+    fixed = _TRAILING_COMMA_RE.sub(r"\1", s)
     try:
-        return json.loads(fixed)
+        return _loads(fixed)
     except json.JSONDecodeError:
         pass
     # Escape raw newlines/tabs inside double-quoted strings (LLMs often forget to escape)
     fixed = _escape_newlines_in_json_strings(s)
     try:
-        return json.loads(fixed)
+        return _loads(fixed)
     except json.JSONDecodeError:
         pass
-    fixed = re.sub(r",\s*}", "}", re.sub(r",\s*]", "]", fixed))
+    fixed = _TRAILING_COMMA_RE.sub(r"\1", fixed)
     try:
-        return json.loads(fixed)
+        return _loads(fixed)
     except json.JSONDecodeError:
         return None
 
 
+def _escape_string_body(m: "re.Match") -> str:
+    body = m.group(1)
+    return '"' + body.replace("\n", "\\n").replace("\r", "\\r").replace("\t", "\\t") + '"'
+
+
 def _escape_newlines_in_json_strings(s: str) -> str:
     """Replace raw newlines and tabs inside JSON string values with \\n and \\t."""
-    result = []
-    i = 0
-    in_string = False
-    escape = False
-    while i < len(s):
-        c = s[i]
-        if not in_string:
-            result.append(c)
-            if c == '"':
-                in_string = True
-            i += 1
-            continue
-        if escape:
-            result.append(c)
-            escape = False
-            i += 1
-            continue
-        if c == "\\":
-            result.append(c)
-            escape = True
-            i += 1
-            continue
-        if c == '"':
-            result.append(c)
-            in_string = False
-            i += 1
-            continue
-        if c == "\n":
-            result.append("\\n")
-            i += 1
-            continue
-        if c == "\r":
-            result.append("\\r")
-            i += 1
-            continue
-        if c == "\t":
-            result.append("\\t")
-            i += 1
-            continue
-        result.append(c)
-        i += 1
-    return "".join(result)
+    return _JSON_STRING_RE.sub(_escape_string_body, s)
 
 
 def extract_json_from_llm(response: str):
@@ -90,51 +81,27 @@ def extract_json_from_llm(response: str):
             text = text[start:end].strip()
     if not text:
         raise ValueError("LLM returned no JSON. It may have returned an error message instead.")
-    # Strip leading text before first { or [ (e.g. "Here is the JSON:" or explanatory sentence)
-    for start_char in ("{", "["):
-        pos = text.find(start_char)
+    # Strip leading text before the first { or [, whichever comes first
+    # (e.g. "Here is the JSON:" or an explanatory sentence)
+    starts = [p for p in (text.find("{"), text.find("[")) if p != -1]
+    if starts:
+        pos = min(starts)
         if pos > 0:
             text = text[pos:].strip()
-            break
     parsed = _try_parse(text)
     if parsed is not None:
         return parsed
-    # Find first complete { ... } or [ ... ] (brace-matching, ignoring quotes naively can fail)
-    for start_char, end_char in (("{", "}"), ("[", "]")):
-        idx = text.find(start_char)
-        if idx == -1:
-            continue
-        depth = 0
-        in_str = None
-        escape = False
-        for i in range(idx, len(text)):
-            c = text[i]
-            if escape:
-                escape = False
-                continue
-            if c == "\\" and in_str:
-                escape = True
-                continue
-            if in_str:
-                if c == in_str:
-                    in_str = None
-                continue
-            if c in ('"', "'"):
-                in_str = c
-                continue
-            if c == start_char:
-                depth += 1
-            elif c == end_char:
-                depth -= 1
-                if depth == 0:
-                    chunk = text[idx : i + 1]
-                    parsed = _try_parse(chunk)
-                    if parsed is not None:
-                        return parsed
-                    break
-        else:
-            continue
-        break
+    # Find the first complete JSON value with raw_decode (C scanner with its
+    # own quote/depth tracking), trying each { or [ in turn; scan the repaired
+    # text too so trailing commas / raw newlines still recover.
+    for candidate in (text, _TRAILING_COMMA_RE.sub(r"\1", _escape_newlines_in_json_strings(text))):
+        idx = _first_json_start(candidate, 0)
+        while idx != -1:
+            try:
+                parsed, _ = _DECODER.raw_decode(candidate, idx)
+                return parsed
+            except json.JSONDecodeError:
+                idx = _first_json_start(candidate, idx + 1)
     snippet = (text[:400] + "...") if len(text) > 400 else text
     raise ValueError(
         "LLM did not return valid JSON. Try shorter documents or check the model response. "
@@ -142,10 +109,13 @@ def extract_json_from_llm(response: str):
     )
 
 
-def clean_text(text):
+_TAB_TABLE = str.maketrans({"\t": " "})
+_MULTI_SPACE_RE = re.compile(" {2,}")
+_MULTI_NL_RE = re.compile("\n{3,}")
 
-    text = text.replace("\t", " ")
-    text = re.sub(" +", " ", text)
-    text = re.sub("\n{3,}", "\n\n", text)
 
+def clean_text(text):
+    text = text.translate(_TAB_TABLE)
+    text = _MULTI_SPACE_RE.sub(" ", text)
+    text = _MULTI_NL_RE.sub("\n\n", text)
     return text.strip()